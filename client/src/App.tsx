@@ -19,7 +19,6 @@ interface Players {
 }
 
 interface Player {
-  hand: string[]
   is_winner: boolean
   name: string
   scores: number[]
@@ -28,6 +27,17 @@ interface Player {
   tricks: Trick[]
 }
 
+interface ServerMessage {
+  card_scores?: number[]
+  delay_ms?: number
+  game_state?: GameState
+  game_state_delta?: Partial<GameState>
+  hand?: string[]
+  player_id?: string
+  players?: Players
+  players_delta?: Players
+}
+
 interface Trick {
   cards: string[]
   leading_suit: string
@@ -50,28 +60,52 @@ function App() {
   const [cardScores, setCardScores] = useState<number[]>([])
   const [errorMessage, setErrorMessage] = useState<string>('')
   const [gameState, setGameState] = useState<GameState | null>(null)
+  const [hand, setHand] = useState<string[]>([])
   const [isConnected, setIsConnected] = useState<boolean>(false)
   const [players, setPlayers] = useState<Players>({})
   const [playerId, setPlayerId] = useState('')
 
+  const isPlayingRef = useRef<boolean>(false)
+  const messageQueueRef = useRef<ServerMessage[]>([])
   const websocketRef = useRef<WebSocket | null>(null)
 
   useEffect(() => {
     const websocket = connectWebSocket()
     websocketRef.current = websocket
 
+    const applyMessage = (data: ServerMessage) => {
+      if (data.card_scores) setCardScores(data.card_scores)
+      if (data.game_state) setGameState(data.game_state)
+      if (data.game_state_delta) setGameState((prev) => prev && { ...prev, ...data.game_state_delta })
+      if (data.hand) setHand(data.hand)
+      if (data.players) setPlayers(data.players)
+      if (data.players_delta) setPlayers((prev) => ({ ...prev, ...data.players_delta }))
+      if (data.player_id) setPlayerId(data.player_id)
+    }
+
+    // Apply messages in order, holding each one on screen for its delay_ms
+    const playMessages = async () => {
+      if (isPlayingRef.current) return
+      isPlayingRef.current = true
+
+      while (messageQueueRef.current.length) {
+        const data = messageQueueRef.current.shift() as ServerMessage
+        applyMessage(data)
+
+        if (data.delay_ms) await new Promise((resolve) => setTimeout(resolve, data.delay_ms))
+      }
+
+      isPlayingRef.current = false
+    }
+
     websocket.onopen = () => {
       setIsConnected(true)
     }
 
     websocket.onmessage = (event) => {
       try {
-        const data = JSON.parse(event.data)
-
-        if (data.card_scores) setCardScores(data.card_scores)
-        if (data.game_state) setGameState(data.game_state)
-        if (data.players) setPlayers(data.players)
-        if (data.player_id) setPlayerId(data.player_id)
+        messageQueueRef.current.push(JSON.parse(event.data))
+        playMessages()
       } catch (error) {
         console.error(error)
       }
@@ -126,6 +160,7 @@ function App() {
         cardScores={cardScores}
         gameState={gameState}
         handleAction={handleAction}
+        hand={hand}
         players={players}
         playerId={playerId}
       />
@@ -227,11 +262,12 @@ interface GameBoardProps {
   cardScores: number[]
   gameState: GameState
   handleAction: (action: string, data?: Record<string, string>) => void
+  hand: string[]
   players: Players
   playerId: string
 }
 
-function GameBoard({ cardScores, gameState, handleAction, players, playerId }: GameBoardProps) {
+function GameBoard({ cardScores, gameState, handleAction, hand, players, playerId }: GameBoardProps) {
   const handleEndGame = () => {
     if (confirm('Are you sure you want to end the game for everyone?')) handleAction('reset_game')
   }
@@ -260,6 +296,7 @@ function GameBoard({ cardScores, gameState, handleAction, players, playerId }: G
       <Hand //
         gameState={gameState}
         handleAction={handleAction}
+        hand={hand}
         player={players[playerId]}
       />
       <p>Your tricks:</p>
@@ -410,10 +447,11 @@ function DiscardPile({ cardScores, gameState, players }: DiscardPile) {
 interface HandProps {
   gameState: GameState
   handleAction: (action: string, data?: Record<string, string>) => void
+  hand: string[]
   player: Player
 }
 
-function Hand({ gameState, handleAction, player }: HandProps) {
+function Hand({ gameState, handleAction, hand, player }: HandProps) {
   const isCardDisabled = (card: string) => {
     const leadingSuit = gameState.current_trick.leading_suit
     const cardSuit = card[card.length - 1]
@@ -421,7 +459,7 @@ function Hand({ gameState, handleAction, player }: HandProps) {
     const isTurnComplete = gameState.turn_phase == 'TURN_COMPLETE'
     const isNotMyTurn = player.player_id != gameState.current_player_id
     const isNotLeadingSuit = leadingSuit && cardSuit != leadingSuit
-    const isLeadingSuitInHand = player.hand.some((card) => card[card.length - 1] == leadingSuit)
+    const isLeadingSuitInHand = hand.some((card) => card[card.length - 1] == leadingSuit)
 
     if (isTurnComplete) return true
     if (isNotMyTurn) return true
@@ -432,7 +470,7 @@ function Hand({ gameState, handleAction, player }: HandProps) {
 
   return (
     <div className='hand'>
-      {player.hand.map((card) => (
+      {hand.map((card) => (
         <Card //
           card={card}
           disabled={isCardDisabled(card)}
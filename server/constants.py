@@ -7,11 +7,36 @@ DECK = [
     # fmt: on
 ]
 
+# Clients pause for the delay_ms attached to a frame before applying the next
+BOT_TURN_DELAY_MS = 500
+
+# Cards are handled internally as their index in DECK, which is grouped by
+# suit in ascending rank: a card's suit is card // 13 and its rank card % 13 + 2
+CARD_IDS = {card: card_id for card_id, card in enumerate(DECK)}
+
+# delay_ms for each card score as it is revealed, plus a hold after the last
+CARD_SCORE_DELAY_MS = 250
+CARD_SCORES_HOLD_MS = 500
+
 GAME_EXPIRATION_SECONDS = 3600
 
+HEARTS = CARD_IDS["2H"] // 13
+
+KING_OF_SPADES = CARD_IDS["KS"]
+
 MAX_PLAYERS = 4
 MIN_PLAYERS = 4
 
 NUM_ROUNDS = 5
 
+# Frames a client may fall behind by before it is treated as disconnected
+OUTBOX_MAX_SIZE = 100
+
+QUEENS = frozenset(CARD_IDS[card] for card in ["QC", "QD", "QH", "QS"])
+
+SUITS = ["H", "D", "C", "S"]
+
+# Hands are also tracked as a bitmask with bit n set for card n
+SUIT_MASKS = [((1 << 13) - 1) << (suit * 13) for suit in range(len(SUITS))]
+
 SUIT_ORDER = ["D", "C", "H", "S"]
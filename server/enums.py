@@ -1,18 +1,18 @@
-from enum import auto, Enum
+from enum import auto, IntEnum
 
 
-class PlayerType(Enum):
+class PlayerType(IntEnum):
     BOT = auto()
     HUMAN = auto()
 
 
-class GamePhase(Enum):
+class GamePhase(IntEnum):
     NOT_STARTED = auto()
     IN_PROGRESS = auto()
     GAME_COMPLETE = auto()
 
 
-class TurnPhase(Enum):
+class TurnPhase(IntEnum):
     NOT_STARTED = auto()
     IN_PROGRESS = auto()
     TURN_COMPLETE = auto()
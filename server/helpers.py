@@ -1,54 +1,81 @@
-from nanoid import generate
-from typing import List
+import orjson
+import os
+from typing import Any, Dict, List, Optional
 
+from constants import CARD_IDS, DECK, SUIT_ORDER, SUITS
+
+_PLAYER_ID_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_PLAYER_ID_SIZE = 4
+
+# Largest multiple of the alphabet size that fits in a byte; bytes at or above
+# it are rejected so that every symbol is equally likely
+_PLAYER_ID_BYTE_LIMIT = 256 // len(_PLAYER_ID_ALPHABET) * len(_PLAYER_ID_ALPHABET)
 
-def generate_player_id() -> str:
-    return generate(alphabet="0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ", size=4)
 
+def card_from_str(card: str) -> Optional[int]:
+    return CARD_IDS.get(card)
 
-def get_cards_of_suit(cards: List[str], suit: str) -> List[str]:
-    return [card for card in cards if get_suit(card) == suit]
 
+def card_to_str(card: Optional[int]) -> str:
+    if card is None:
+        return ""
+    return DECK[card]
 
-def get_rank(card: str) -> int:
-    return parse_card(card)[0]
 
+def cards_to_strs(cards: List[int]) -> List[str]:
+    return [DECK[card] for card in cards]
 
-def get_suit(card: str) -> str:
-    return parse_card(card)[1]
 
+def diff_dict(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value for key, value in new.items() if key not in old or old[key] != value
+    }
 
-def is_higher_rank(card_a: str, card_b: str) -> bool:
-    if not card_a:
-        return False
 
-    if not card_b:
-        return True
+def encode_json(payload: Dict[str, Any]) -> str:
+    return orjson.dumps(payload).decode()
 
-    card_a_rank, card_a_suit = parse_card(card_a)
-    card_b_rank, card_b_suit = parse_card(card_b)
 
-    if card_a_suit != card_b_suit:
-        return False
+def generate_player_id() -> str:
+    symbols = []
+    while len(symbols) < _PLAYER_ID_SIZE:
+        for byte in os.urandom(2 * _PLAYER_ID_SIZE):
+            if byte < _PLAYER_ID_BYTE_LIMIT and len(symbols) < _PLAYER_ID_SIZE:
+                symbols.append(_PLAYER_ID_ALPHABET[byte % len(_PLAYER_ID_ALPHABET)])
+    return "".join(symbols)
+
 
-    return card_a_rank > card_b_rank
+def get_cards_in_mask(mask: int) -> List[int]:
+    cards = []
+    while mask:
+        lowest_bit = mask & -mask
+        cards.append(lowest_bit.bit_length() - 1)
+        mask ^= lowest_bit
+    return cards
 
 
-def parse_card(card: str) -> tuple[int, str]:
-    rank = card[:-1]
-    suit = card[-1]
+def get_rank(card: int) -> int:
+    return card % 13 + 2
 
-    if rank == "A":
-        rank = "14"
-    elif rank == "K":
-        rank = "13"
-    elif rank == "Q":
-        rank = "12"
-    elif rank == "J":
-        rank = "11"
 
-    return int(rank), suit
+def get_suit(card: int) -> int:
+    return card // 13
 
 
 def rotate_index(index: int, length: int) -> int:
     return (index + 1) % length
+
+
+def suit_to_str(suit: Optional[int]) -> str:
+    if suit is None:
+        return ""
+    return SUITS[suit]
+
+
+# Packed (suit order, rank) key; bound to list.__getitem__ so that sort, min
+# and max call straight into C instead of a Python key function per card
+_SORT_KEY = [
+    SUIT_ORDER.index(SUITS[get_suit(card)]) * 100 + get_rank(card)
+    for card in CARD_IDS.values()
+]
+get_sort_key = _SORT_KEY.__getitem__
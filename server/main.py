@@ -1,7 +1,8 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-import json
+import orjson
 import os
+import sys
 import uvicorn
 
 from enums import GamePhase
@@ -39,8 +40,8 @@ async def websocket_endpoint(websocket: WebSocket):
     if game_engine.game_state.is_expired():
         game_engine.reset_game()
 
-    player_id = websocket.query_params.get("player_id")
-    if game_engine.players.is_new_player(player_id):
+    player = game_engine.players.get(websocket.query_params.get("player_id"))
+    if player is None:
         if game_engine.game_state.is_started():
             await websocket.close(code=1000, reason="A game is already in session.")
             return
@@ -48,34 +49,34 @@ async def websocket_endpoint(websocket: WebSocket):
             await websocket.close(code=1000, reason="The lobby is full.")
             return
 
-        player_id = generate_player_id()
-        game_engine.players.add_player(player_id)
+        player = game_engine.players.add_player(generate_player_id())
 
-    player = game_engine.players[player_id]
+    player_id = player.player_id
     player.set_websocket(websocket)
 
-    await player.send(
+    player.send(
         {
             "game_state": game_engine.game_state.to_dict(),
             "players": game_engine.players.to_dict(),
             "player_id": player_id,
         }
     )
+    player.send_hand()
 
     try:
         while True:
             message = await websocket.receive_text()
-            data = json.loads(message)
+            data = orjson.loads(message)
             action = data.get("action")
 
-            await game_engine.handle_action(action, data)
+            game_engine.handle_action(action, data)
     except WebSocketDisconnect:
         player.clear_websocket()
 
         if game_engine.game_state.game_phase == GamePhase.NOT_STARTED:
             del game_engine.players[player_id]
 
-        await game_engine.players.broadcast({"players": game_engine.players.to_dict()})
+        game_engine.players.broadcast({"players": game_engine.players.to_dict()})
 
 
 if __name__ == "__main__":
@@ -83,5 +84,12 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
+        # uvloop has no Windows build, so fall back to asyncio there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_per_message_deflate=True,
+        # Clients only send small action messages
+        ws_max_size=64 * 1024,
         reload=True,
     )
@@ -1,21 +1,52 @@
+import asyncio
 from datetime import datetime
 from fastapi import WebSocket
-from typing import Any, Dict, List
-
-from constants import GAME_EXPIRATION_SECONDS, MAX_PLAYERS, NUM_ROUNDS
+from typing import Any, Dict, List, Optional
+
+from constants import (
+    GAME_EXPIRATION_SECONDS,
+    MAX_PLAYERS,
+    NUM_ROUNDS,
+    OUTBOX_MAX_SIZE,
+    SUIT_MASKS,
+)
 from enums import GamePhase, PlayerType, TurnPhase
-from helpers import generate_player_id, is_higher_rank, parse_card
+from helpers import (
+    card_to_str,
+    cards_to_strs,
+    encode_json,
+    generate_player_id,
+    get_suit,
+    suit_to_str,
+)
 
 
 class GameState:
+    __slots__ = (
+        "cards_remaining",
+        "current_round",
+        "current_trick",
+        "created_at",
+        "discard_pile",
+        "game_phase",
+        "round_start_index",
+        "turn_order",
+        "turn_order_indexes",
+        "current_turn_index",
+        "turn_phase",
+        "trick_start_index",
+    )
+
     def __init__(self):
+        self.cards_remaining: int = 0
         self.current_round: int = 1
         self.current_trick: Trick = Trick()
         self.created_at: datetime = datetime.now()
-        self.discard_pile: List[str] = []
+        self.discard_pile: List[int] = []
         self.game_phase: GamePhase = GamePhase.NOT_STARTED
         self.round_start_index: int = 0
         self.turn_order: List[str] = []
+        self.turn_order_indexes: Dict[str, int] = {}
         self.current_turn_index: int = 0
         self.turn_phase: TurnPhase = TurnPhase.NOT_STARTED
         self.trick_start_index: int = 0
@@ -44,7 +75,7 @@ class GameState:
             "current_player_id": self.current_player_id,
             "current_round": self.current_round,
             "current_trick": self.current_trick.to_dict(),
-            "discard_pile": self.discard_pile,
+            "discard_pile": cards_to_strs(self.discard_pile),
             "game_phase": self.game_phase.name,
             "turn_phase": self.turn_phase.name,
             "trick_start_index": self.trick_start_index,
@@ -52,88 +83,195 @@ class GameState:
 
 
 class Player:
+    __slots__ = (
+        "hand",
+        "hand_mask",
+        "is_hand_sent",
+        "is_winner",
+        "name",
+        "player_id",
+        "scores",
+        "total_score",
+        "tricks",
+        "type",
+        "websocket",
+        "outbox",
+        "_close_task",
+        "_dict_cache",
+        "_sender_task",
+    )
+
     def __init__(
         self,
         name: str,
         player_id: str,
         type: PlayerType,
     ):
-        self.hand: List[str] = []
+        self.hand: List[int] = []
+        self.hand_mask: int = 0
+        self.is_hand_sent: bool = False
         self.is_winner: bool = False
         self.name: str = name
         self.player_id: str = player_id
         self.scores: List[int] = [0] * NUM_ROUNDS
+        self.total_score: int = 0
         self.tricks: List[Trick] = []
         self.type: PlayerType = type
         self.websocket: WebSocket = None
+        self.outbox: Optional[asyncio.Queue[str]] = None
+        self._close_task: Optional[asyncio.Task] = None
+        self._dict_cache: Optional[Dict[str, Any]] = None
+        self._sender_task: Optional[asyncio.Task] = None
 
     def set_websocket(self, websocket: WebSocket):
+        self.clear_websocket()
+
         self.websocket = websocket
+        self.outbox = asyncio.Queue(maxsize=OUTBOX_MAX_SIZE)
+        self._sender_task = asyncio.create_task(
+            self._drain_outbox(websocket, self.outbox)
+        )
 
     def clear_websocket(self):
+        if self._sender_task:
+            self._sender_task.cancel()
+
         self.websocket = None
+        self.outbox = None
+        self._sender_task = None
+
+    def send(self, payload: Dict[str, Any]):
+        self.send_text(encode_json(payload))
+
+    def send_text(self, text: str):
+        """
+        Queue a frame for this player's sender task so that game logic never
+        waits on a socket write
+        """
 
-    async def send(self, payload: Dict[str, Any]):
         if not self.websocket:
             return
 
         try:
-            await self.websocket.send_json(payload)
-        except Exception:
+            self.outbox.put_nowait(text)
+        except asyncio.QueueFull:
+            # Too far behind to catch up, so close the socket and let the
+            # client reconnect for a fresh snapshot
+            websocket = self.websocket
             self.clear_websocket()
+            self._close_task = asyncio.create_task(self._close_websocket(websocket))
+
+    def send_hand(self):
+        """
+        Hands are private, so each player's own hand is sent to them alone
+        rather than being part of the broadcast state
+        """
+
+        # Skip bots and disconnected players; reconnects resend the hand
+        if not self.websocket:
+            return
+
+        self.send({"hand": cards_to_strs(self.hand)})
+        self.is_hand_sent = True
+
+    async def _close_websocket(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+
+    async def _drain_outbox(self, websocket: WebSocket, outbox: asyncio.Queue):
+        try:
+            while True:
+                await websocket.send_text(await outbox.get())
+        except Exception:
+            # Leave a newer connection alone if the player has reconnected
+            if self.websocket is websocket:
+                self.clear_websocket()
 
     def is_bot(self) -> bool:
         return self.type == PlayerType.BOT
 
-    def has_suit_in_hand(self, suit: str) -> bool:
-        for card in self.hand:
-            card_suit = parse_card(card)[1]
-            if card_suit == suit:
-                return True
-        return False
+    def set_name(self, name: str):
+        self.name = name
+        self._dict_cache = None
+
+    def set_winner(self):
+        self.is_winner = True
+        self._dict_cache = None
+
+    def set_hand(self, hand: List[int]):
+        self.hand = hand
+        self.hand_mask = 0
+        for card in hand:
+            self.hand_mask |= 1 << card
+        self.is_hand_sent = False
+
+    def has_card_in_hand(self, card: int) -> bool:
+        return bool(self.hand_mask >> card & 1)
+
+    def has_suit_in_hand(self, suit: int) -> bool:
+        return bool(self.hand_mask & SUIT_MASKS[suit])
+
+    def remove_card_from_hand(self, card: int):
+        self.hand.remove(card)
+        self.hand_mask &= ~(1 << card)
+        self.is_hand_sent = False
 
     def take_trick(self, trick: "Trick"):
         self.tricks.append(trick)
+        self._dict_cache = None
+
+    def clear_tricks(self):
+        self.tricks.clear()
+        self._dict_cache = None
 
     def update_scores(self, round: int, score: int):
         round_index = round - 1
         if 0 <= round_index < NUM_ROUNDS:
             self.scores[round_index] += score
+            self.total_score += score
+            self._dict_cache = None
 
     def reset(self):
         self.hand.clear()
+        self.hand_mask = 0
+        self.is_hand_sent = False
         self.is_winner = False
         self.scores = [0] * NUM_ROUNDS
+        self.total_score = 0
         self.tricks.clear()
+        self._dict_cache = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "hand": self.hand,
-            "is_winner": self.is_winner,
-            "name": self.name,
-            "player_id": self.player_id,
-            "scores": self.scores,
-            "total_score": sum(self.scores),
-            "tricks": [trick.to_dict() for trick in self.tricks],
-        }
+        # Broadcasts go out on every turn; only rebuild after a mutation
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "is_winner": self.is_winner,
+                "name": self.name,
+                "player_id": self.player_id,
+                "scores": self.scores.copy(),
+                "total_score": self.total_score,
+                "tricks": [trick.to_dict() for trick in self.tricks],
+            }
+        return self._dict_cache
 
 
 class Players(Dict[str, Player]):
     def __init__(self):
         super().__init__()
 
-    def is_new_player(self, player_id: str) -> bool:
-        return not player_id or player_id not in self
-
     def is_full(self) -> bool:
         return len(self) >= MAX_PLAYERS
 
-    def add_player(self, player_id: str):
-        self[player_id] = Player(
+    def add_player(self, player_id: str) -> Player:
+        player = Player(
             name=f"Player #{player_id}",
             player_id=player_id,
             type=PlayerType.HUMAN,
         )
+        self[player_id] = player
+        return player
 
     def add_bots(self):
         while len(self) < MAX_PLAYERS:
@@ -148,7 +286,7 @@ class Players(Dict[str, Player]):
 
     def clear_tricks(self):
         for player in self.values():
-            player.tricks.clear()
+            player.clear_tricks()
 
     def reset(self):
         self._clear_bots()
@@ -166,34 +304,63 @@ class Players(Dict[str, Player]):
                 bot_ids.append(player.player_id)
         return bot_ids
 
-    async def broadcast(self, payload: Dict[str, Any]):
+    def send_hands(self):
         for player in self.values():
-            await player.send(payload)
+            if not player.is_hand_sent:
+                player.send_hand()
+
+    def broadcast(self, payload: Dict[str, Any]):
+        # Encode once for every recipient rather than once per socket
+        text = encode_json(payload)
+        for player in self.values():
+            player.send_text(text)
 
     def to_dict(self) -> Dict[str, Player]:
         return {player_id: player.to_dict() for player_id, player in self.items()}
 
 
 class Trick:
+    __slots__ = (
+        "cards",
+        "is_last_trick",
+        "leading_suit",
+        "winner_id",
+        "winning_card",
+        "_dict_cache",
+    )
+
     def __init__(self):
-        self.cards: List[str] = []
+        self.cards: List[int] = []
         self.is_last_trick: bool = False
-        self.leading_suit: str = ""
+        self.leading_suit: Optional[int] = None
         self.winner_id: str = ""
-        self.winning_card: str = ""
+        self.winning_card: Optional[int] = None
+        self._dict_cache: Optional[Dict[str, Any]] = None
 
-    def update(self, card: str, player_id: str):
-        if not self.leading_suit:
-            card_suit = card[-1]
-            self.leading_suit = card_suit
+    def set_cards(self, cards: List[int]):
+        self.cards = cards
+        self._dict_cache = None
 
-        if is_higher_rank(card, self.winning_card):
+    def update(self, card: int, player_id: str):
+        suit = get_suit(card)
+
+        if self.leading_suit is None:
+            self.leading_suit = suit
+
+        # Within a suit, card ids ascend with rank
+        if self.winning_card is None or (
+            suit == self.leading_suit and card > self.winning_card
+        ):
             self.winning_card = card
             self.winner_id = player_id
 
+        self._dict_cache = None
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "cards": self.cards,
-            "leading_suit": self.leading_suit,
-            "winning_card": self.winning_card,
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "cards": cards_to_strs(self.cards),
+                "leading_suit": suit_to_str(self.leading_suit),
+                "winning_card": card_to_str(self.winning_card),
+            }
+        return self._dict_cache
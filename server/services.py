@@ -1,27 +1,45 @@
-import asyncio
 import random
-from typing import List
-
-from constants import DECK, NUM_ROUNDS, SUIT_ORDER
+from typing import Any, Dict, List
+
+from constants import (
+    BOT_TURN_DELAY_MS,
+    CARD_IDS,
+    CARD_SCORE_DELAY_MS,
+    CARD_SCORES_HOLD_MS,
+    HEARTS,
+    KING_OF_SPADES,
+    NUM_ROUNDS,
+    QUEENS,
+    SUIT_MASKS,
+    SUITS,
+)
 from enums import GamePhase, TurnPhase
-from helpers import get_cards_of_suit, get_rank, parse_card, rotate_index
+from helpers import (
+    card_from_str,
+    diff_dict,
+    get_cards_in_mask,
+    get_rank,
+    get_sort_key,
+    get_suit,
+    rotate_index,
+)
 from models import GameState, Player, Players, Trick
 
 
 class BotStrategy:
     @staticmethod
-    def choose_card(player: "Player", current_trick: "Trick") -> str:
+    def choose_card(player: "Player", current_trick: "Trick") -> int:
         """
         1. If bot leads trick, play lowest card in hand
         2. If bot can follow leading suit, play lowest card of that suit
         3. If bot cannot follow leading suit, play highest card in hand
         """
 
-        if not current_trick.leading_suit:
+        if current_trick.leading_suit is None:
             return BotStrategy._get_lowest_card(player.hand)
 
-        cards_of_leading_suit = get_cards_of_suit(
-            player.hand, current_trick.leading_suit
+        cards_of_leading_suit = get_cards_in_mask(
+            player.hand_mask & SUIT_MASKS[current_trick.leading_suit]
         )
 
         if cards_of_leading_suit:
@@ -32,27 +50,42 @@ class BotStrategy:
             return BotStrategy._get_highest_card(player.hand)
 
     @staticmethod
-    def _get_card_of_leading_suit(cards: List[str], trick_cards: List[str]) -> str:
-        lowest_card = min(cards, key=get_rank)
+    def _get_card_of_leading_suit(cards: List[int], trick_cards: List[int]) -> int:
+        # Cards of a single suit come out of the hand mask in ascending rank
+        lowest_card = cards[0]
 
         if not trick_cards:
             return lowest_card
 
-        lowest_trick_card = min(trick_cards, key=get_rank)
+        lowest_trick_rank = min(get_rank(card) for card in trick_cards)
 
-        if get_rank(lowest_card) > get_rank(lowest_trick_card):
+        if get_rank(lowest_card) > lowest_trick_rank:
             return lowest_card
 
-        cards_lower_than_lowest_trick_card = []
+        # Ids of a single suit order by rank, so plain max picks the highest
+        return max(card for card in cards if get_rank(card) < lowest_trick_rank)
+
+    @staticmethod
+    def _get_suit_stats(cards: List[int]) -> List[tuple[int, int]]:
+        """
+        Count and total rank of each suit in cards, computed once per choice
+        instead of once per card compared
+        """
+
+        counts = [0] * len(SUITS)
+        rank_sums = [0] * len(SUITS)
         for card in cards:
-            if get_rank(card) < get_rank(lowest_trick_card):
-                cards_lower_than_lowest_trick_card.append(card)
+            suit = get_suit(card)
+            counts[suit] += 1
+            rank_sums[suit] += get_rank(card)
 
-        return max(cards_lower_than_lowest_trick_card, key=get_rank)
+        return list(zip(counts, rank_sums))
 
     @staticmethod
-    def _get_highest_card(cards: List[str]) -> str:
-        def _highest_card_key(card: str) -> tuple[int, int, int]:
+    def _get_highest_card(cards: List[int]) -> int:
+        suit_stats = BotStrategy._get_suit_stats(cards)
+
+        def _highest_card_key(card: int) -> tuple[int, int, int]:
             """
             Sorting preference:
             1. Higher rank (dump more dangerous cards first)
@@ -60,17 +93,16 @@ class BotStrategy:
             3. Suit with higher total rank (dump from dangerous suits)
             """
 
-            rank, suit = parse_card(card)
-            cards_of_suit = get_cards_of_suit(cards, suit)
-            cos_count = len(cards_of_suit)
-            cos_rank_sum = sum(get_rank(card) for card in cards_of_suit)
-            return (rank, -cos_count, cos_rank_sum)
+            cos_count, cos_rank_sum = suit_stats[get_suit(card)]
+            return (get_rank(card), -cos_count, cos_rank_sum)
 
         return max(cards, key=_highest_card_key)
 
     @staticmethod
-    def _get_lowest_card(cards: List[str]) -> str:
-        def _lowest_card_key(card: str) -> tuple[int, int, int]:
+    def _get_lowest_card(cards: List[int]) -> int:
+        suit_stats = BotStrategy._get_suit_stats(cards)
+
+        def _lowest_card_key(card: int) -> tuple[int, int, int]:
             """
             Sorting preference:
             1. Lower rank (dump safer cards first)
@@ -78,36 +110,27 @@ class BotStrategy:
             3. Suit with lower total rank (dump from safer suits)
             """
 
-            rank, suit = parse_card(card)
-            cards_of_suit = get_cards_of_suit(cards, suit)
-            cos_count = len(cards_of_suit)
-            cos_rank_sum = sum(get_rank(card) for card in cards_of_suit)
-            return (rank, cos_count, cos_rank_sum)
+            cos_count, cos_rank_sum = suit_stats[get_suit(card)]
+            return (get_rank(card), cos_count, cos_rank_sum)
 
         return min(cards, key=_lowest_card_key)
 
 
 class DeckManager:
     def __init__(self):
-        self.deck = DECK.copy()
+        self.deck = list(CARD_IDS.values())
+        self.rng = random.Random()
 
     def shuffle(self):
-        random.shuffle(self.deck)
+        self.rng.shuffle(self.deck)
 
-    def deal_hands(self, players: Players) -> List[List[str]]:
+    def deal_hands(self, players: Players) -> None:
         hand_size = len(self.deck) // len(players)
 
-        for player in players.values():
-            player.hand = self.deck[:hand_size]
-            self.deck = self.deck[hand_size:]
-            player.hand.sort(key=self._get_card_sort_key)
-
-    def _get_card_sort_key(self, card: str) -> tuple[int, int]:
-        rank, suit = parse_card(card)
-        return (SUIT_ORDER.index(suit), rank)
-
-    def reset(self):
-        self.deck = DECK.copy()
+        for index, player in enumerate(players.values()):
+            start = index * hand_size
+            hand = self.deck[start : start + hand_size]
+            player.set_hand(sorted(hand, key=get_sort_key))
 
 
 class GameEngine:
@@ -116,76 +139,106 @@ class GameEngine:
         self.players = Players()
         self.bot_strategy = BotStrategy()
         self.deck_manager = DeckManager()
+        self._sent_game_state: Dict[str, Any] = {}
+        self._sent_players: Dict[str, Any] = {}
 
-    async def handle_action(self, action: str, data: dict = {}):
+    def handle_action(self, action: str, data: dict = {}):
         if action == "update_name":
-            await self._update_name(data["player_id"], data["name"])
+            self._update_name(data["player_id"], data["name"])
 
         elif action == "start_game":
-            await self._start_game()
+            self._start_game()
 
         elif action == "play_card":
-            await self._play_card(data["player_id"], data["card"])
+            self._play_card(data["player_id"], card_from_str(data["card"]))
 
         elif action == "reset_game":
-            await self.reset_game()
+            self.reset_game()
 
-    async def _update_name(self, player_id: str, new_name: str):
-        self.players[player_id].name = new_name.strip()
+    def _update_name(self, player_id: str, new_name: str):
+        self.players[player_id].set_name(new_name.strip())
 
-        await self._broadcast_state()
+        self._broadcast_state()
 
-    async def _broadcast_state(self):
-        await self.players.broadcast(
-            {
-                "game_state": self.game_state.to_dict(),
-                "players": self.players.to_dict(),
-            }
-        )
+    def _broadcast_state(self, delay_ms: int = 0):
+        """
+        Clients get a full snapshot on connect, so only send the top-level
+        fields that changed since the last broadcast
+        """
+
+        game_state = self.game_state.to_dict()
+        players = self.players.to_dict()
+
+        payload = {"game_state_delta": diff_dict(self._sent_game_state, game_state)}
+        if players.keys() == self._sent_players.keys():
+            payload["players_delta"] = diff_dict(self._sent_players, players)
+        else:
+            # A delta cannot express a removed player, so resend everyone
+            payload["players"] = players
+
+        if delay_ms:
+            payload["delay_ms"] = delay_ms
 
-    async def _start_game(self):
+        self._sent_game_state = game_state
+        self._sent_players = players
+
+        self.players.send_hands()
+        self.players.broadcast(payload)
+
+    def _start_game(self):
         self.players.add_bots()
 
         self._set_up_new_round()
         self.game_state.game_phase = GamePhase.IN_PROGRESS
 
-        await self._broadcast_state()
+        self._broadcast_state()
 
     def _set_up_new_round(self):
         self._set_turn_order()
 
-        self.deck_manager.reset()
         self.deck_manager.shuffle()
         self.deck_manager.deal_hands(self.players)
 
+        self.game_state.cards_remaining = sum(
+            len(player.hand) for player in self.players.values()
+        )
+
     def _set_turn_order(self):
         self.game_state.turn_order = list(self.players.keys())
+        self.game_state.turn_order_indexes = {
+            player_id: index
+            for index, player_id in enumerate(self.game_state.turn_order)
+        }
 
-    async def _play_card(self, player_id: str, card: str):
+    def _play_card(self, player_id: str, card: int):
         player = self.players[player_id]
 
         if not self._is_valid_play(player, card):
             return
 
-        player.hand.remove(card)
+        player.remove_card_from_hand(card)
+        self.game_state.cards_remaining -= 1
         self.game_state.discard_pile.append(card)
 
         self.game_state.current_trick.update(card, player_id)
         self.game_state.turn_phase = TurnPhase.TURN_COMPLETE
 
-        await self._broadcast_state()
+        # _end_turn broadcasts the played card along with the next turn, except
+        # a trick's last card, which is shown before the trick is scored
+        if len(self.game_state.discard_pile) == len(self.game_state.turn_order):
+            self._broadcast_state()
 
-        await self._end_turn()
+        self._end_turn()
 
-    def _is_valid_play(self, player: "Player", card: str) -> bool:
-        if card not in player.hand:
+    def _is_valid_play(self, player: "Player", card: int) -> bool:
+        if card is None or not player.has_card_in_hand(card):
             return False
 
-        played_suit = parse_card(card)[1]
+        played_suit = get_suit(card)
         leading_suit = self.game_state.current_trick.leading_suit
 
         if (
-            leading_suit
+            leading_suit is not None
             and player.has_suit_in_hand(leading_suit)
             and played_suit != leading_suit
         ):
@@ -193,9 +246,7 @@ class GameEngine:
 
         return True
 
-    async def _end_turn(self):
-        await asyncio.sleep(0.5)
-
+    def _end_turn(self):
         self.game_state.current_turn_index = rotate_index(
             self.game_state.current_turn_index,
             len(self.game_state.turn_order),
@@ -203,23 +254,25 @@ class GameEngine:
         self.game_state.turn_phase = TurnPhase.NOT_STARTED
 
         if self._is_trick_over():
-            await self._end_trick()
+            self._end_trick()
 
         if self._is_round_over():
             self._end_round()
 
-        await self._broadcast_state()
-
         if self._is_bot_turn():
-            await self._play_bot_turn(self.game_state.current_player_id)
+            # Clients hold this state on screen before showing the bot's play
+            self._broadcast_state(delay_ms=BOT_TURN_DELAY_MS)
+            self._play_bot_turn(self.game_state.current_player_id)
+        else:
+            self._broadcast_state()
 
     def _is_trick_over(self) -> bool:
         return self.game_state.current_turn_index == self.game_state.trick_start_index
 
-    async def _end_trick(self):
+    def _end_trick(self):
         current_trick = self.game_state.current_trick
 
-        current_trick.cards = self.game_state.discard_pile.copy()
+        current_trick.set_cards(self.game_state.discard_pile.copy())
         self.game_state.discard_pile.clear()
 
         if self._is_round_over():
@@ -231,26 +284,30 @@ class GameEngine:
         winner = self.players.get(current_trick.winner_id)
         winner.take_trick(current_trick)
 
-        await self._animate_card_scores(card_scores)
+        self._animate_card_scores(card_scores)
 
         winner.update_scores(current_round, sum(card_scores))
 
-        winner_index = self.game_state.turn_order.index(current_trick.winner_id)
+        winner_index = self.game_state.turn_order_indexes[current_trick.winner_id]
         self.game_state.current_turn_index = winner_index
         self.game_state.trick_start_index = winner_index
 
         self.game_state.current_trick = Trick()
 
-    async def _animate_card_scores(self, card_scores: List[int]):
-        for count, _ in enumerate(card_scores, 1):
-            await self.players.broadcast({"card_scores": card_scores[:count]})
-            await asyncio.sleep(0.25)
+    def _animate_card_scores(self, card_scores: List[int]):
+        for count in range(1, len(card_scores) + 1):
+            delay_ms = CARD_SCORE_DELAY_MS
+            if count == len(card_scores):
+                delay_ms += CARD_SCORES_HOLD_MS
+
+            self.players.broadcast(
+                {"card_scores": card_scores[:count], "delay_ms": delay_ms}
+            )
 
-        await asyncio.sleep(0.5)
-        await self.players.broadcast({"card_scores": []})
+        self.players.broadcast({"card_scores": []})
 
     def _is_round_over(self) -> bool:
-        return all(not player.hand for player in self.players.values())
+        return self.game_state.cards_remaining == 0
 
     def _end_round(self):
         if self._is_game_over():
@@ -277,7 +334,7 @@ class GameEngine:
     def _is_bot_turn(self) -> bool:
         return self.players.get(self.game_state.current_player_id).is_bot()
 
-    async def _play_bot_turn(self, bot_id: str):
+    def _play_bot_turn(self, bot_id: str):
         if self.game_state.game_phase != GamePhase.IN_PROGRESS:
             return
 
@@ -286,54 +343,56 @@ class GameEngine:
             self.game_state.current_trick,
         )
 
-        await self._play_card(bot_id, card)
+        self._play_card(bot_id, card)
 
-    async def reset_game(self):
+    def reset_game(self):
         self.game_state.reset()
         self.players.reset()
 
-        await self._broadcast_state()
+        self._broadcast_state()
 
 
 class ScoreCalculator:
     @staticmethod
     def get_card_scores(trick: "Trick", current_round: int) -> List[int]:
-        card_scores = []
-
-        for card in trick.cards:
-            card_suit = parse_card(card)[1]
-            card_score = 0
-
-            if current_round >= 1:
-                card_score += 1
-            if current_round >= 2 and card_suit == "H":
-                card_score += 10
-            if current_round >= 3 and card in ["QC", "QD", "QH", "QS"]:
-                card_score += 25
-            if current_round >= 4 and card == "KS":
-                card_score += 50
-
-            card_scores.append(card_score)
+        card_penalties = _CARD_PENALTIES[current_round - 1]
+        card_scores = [card_penalties[card] for card in trick.cards]
 
         if current_round >= 5 and trick.is_last_trick:
             card_scores.append(100)
 
         return card_scores
 
+    @staticmethod
+    def _get_card_penalty(card: int, current_round: int) -> int:
+        card_suit = get_suit(card)
+        card_score = 0
+
+        if current_round >= 1:
+            card_score += 1
+        if current_round >= 2 and card_suit == HEARTS:
+            card_score += 10
+        if current_round >= 3 and card in QUEENS:
+            card_score += 25
+        if current_round >= 4 and card == KING_OF_SPADES:
+            card_score += 50
+
+        return card_score
+
     @staticmethod
     def set_winners(players: "Players"):
         if not players:
             return
 
-        score_totals = {}
-        for player_id, player in players.items():
-            score_totals[player_id] = sum(player.scores)
+        lowest_score = min(player.total_score for player in players.values())
 
-        if not score_totals:
-            return
+        for player in players.values():
+            if player.total_score == lowest_score:
+                player.set_winner()
 
-        lowest_score = min(score_totals.values())
 
-        for player_id, player_score in score_totals.items():
-            if player_score == lowest_score:
-                players.get(player_id).is_winner = True
+# Penalty of every card in every round, indexed by [round - 1][card]
+_CARD_PENALTIES = [
+    [ScoreCalculator._get_card_penalty(card, round) for card in CARD_IDS.values()]
+    for round in range(1, NUM_ROUNDS + 1)
+]